@@ -2,84 +2,39 @@ import logging
 import os
 
 import uvicorn
-from a2a.server.apps import A2AStarletteApplication
-from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
-from a2a.types import (
-    AgentCapabilities,
-    AgentCard,
-    AgentSkill,
-)
-from agent import create_agent
-from agent_executor import KarleyAgentExecutor
-from dotenv import load_dotenv
-from google.adk.artifacts import InMemoryArtifactService
-from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-
-load_dotenv()
+from server import HOST, PORT, MissingAPIKeyError, build_app
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class MissingAPIKeyError(Exception):
-    """Exception for missing API key."""
-
-    pass
-
-
 def main():
     """Starts the agent server."""
-    host = "localhost"
-    port = 10002
     try:
-        # Check for API key only if Vertex AI is not configured
-        #if not os.getenv("GOOGLE_GENAI_USE_VERTEXAI") == "TRUE":
-        #    if not os.getenv("GOOGLE_API_KEY"):
-        #        raise MissingAPIKeyError(
-        #            "GOOGLE_API_KEY environment variable not set and GOOGLE_GENAI_USE_VERTEXAI is not TRUE."
-        #        )
-
-        capabilities = AgentCapabilities(streaming=True)
-        skill = AgentSkill(
-            id="check_schedule",
-            name="Check Karley's Schedule",
-            description="Checks Karley's availability for a pickleball game on a given date.",
-            tags=["scheduling", "calendar"],
-            examples=["Is Karley free to play pickleball tomorrow?"],
-        )
-        agent_card = AgentCard(
-            name="Karley Agent",
-            description="An agent that manages Karley's schedule for pickleball games.",
-            url=f"http://{host}:{port}/",
-            version="1.0.0",
-            defaultInputModes=["text/plain"],
-            defaultOutputModes=["text/plain"],
-            capabilities=capabilities,
-            skills=[skill],
-        )
-
-        adk_agent = create_agent()
-        runner = Runner(
-            app_name=agent_card.name,
-            agent=adk_agent,
-            artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
-            memory_service=InMemoryMemoryService(),
-        )
-        agent_executor = KarleyAgentExecutor(runner)
-
-        request_handler = DefaultRequestHandler(
-            agent_executor=agent_executor,
-            task_store=InMemoryTaskStore(),
-        )
-        server = A2AStarletteApplication(
-            agent_card=agent_card, http_handler=request_handler
-        )
-
-        uvicorn.run(server.build(), host=host, port=port)
+        # Number of uvicorn worker processes. Each worker keeps its own
+        # in-memory task, session and memory stores, so values above 1 need
+        # sticky routing (or shared stores) for multi-turn tasks to land on
+        # the same worker.
+        workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+        if workers > 1:
+            logger.warning(
+                "Starting %d workers: in-memory task and session stores are not "
+                "shared between them, so route each conversation to one worker. "
+                "Workers started on different days generate different calendars.",
+                workers,
+            )
+            # Workers are spawned and build the app themselves from an import
+            # string. It must point outside __main__, which spawned workers do
+            # not re-import when the server is started as `python .` or `-m`.
+            uvicorn.run(
+                "server:build_app",
+                factory=True,
+                host=HOST,
+                port=PORT,
+                workers=workers,
+            )
+        else:
+            uvicorn.run(build_app(), host=HOST, port=PORT)
     except MissingAPIKeyError as e:
         logger.error(f"Error: {e}")
         exit(1)
@@ -89,4 +44,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,3 +1,4 @@
+import logging
 import random
 from datetime import date, datetime, timedelta
 
@@ -5,12 +6,17 @@ from google.adk.agents import LlmAgent
 from models import model
 
 
+logger = logging.getLogger(__name__)
+
 model = model()
 
 def generate_karley_calendar() -> dict[str, list[str]]:
     """Generates a random calendar for Karley for the next 7 days."""
     calendar = {}
     today = date.today()
+    # Seeded from the date so every server worker process generates the
+    # same calendar and answers availability questions consistently.
+    rng = random.Random(today.toordinal())
     possible_times = [f"{h:02}:00" for h in range(8, 21)]  # 8 AM to 8 PM
 
     for i in range(7):
@@ -18,10 +24,10 @@ def generate_karley_calendar() -> dict[str, list[str]]:
         date_str = current_date.strftime("%Y-%m-%d")
 
         # Select 8 random unique time slots to increase availability
-        available_slots = sorted(random.sample(possible_times, 8))
+        available_slots = sorted(rng.sample(possible_times, 8))
         calendar[date_str] = available_slots
 
-    print("Karley's calendar:", calendar)
+    logger.debug("Karley's calendar: %s", calendar)
 
     return calendar
 
@@ -0,0 +1,74 @@
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+)
+from agent import create_agent
+from agent_executor import KarleyAgentExecutor
+from dotenv import load_dotenv
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+load_dotenv()
+
+HOST = "localhost"
+PORT = 10002
+
+
+class MissingAPIKeyError(Exception):
+    """Exception for missing API key."""
+
+    pass
+
+
+def build_app():
+    """Builds the A2A server application for Karley's agent."""
+    # Check for API key only if Vertex AI is not configured
+    #if not os.getenv("GOOGLE_GENAI_USE_VERTEXAI") == "TRUE":
+    #    if not os.getenv("GOOGLE_API_KEY"):
+    #        raise MissingAPIKeyError(
+    #            "GOOGLE_API_KEY environment variable not set and GOOGLE_GENAI_USE_VERTEXAI is not TRUE."
+    #        )
+
+    capabilities = AgentCapabilities(streaming=True)
+    skill = AgentSkill(
+        id="check_schedule",
+        name="Check Karley's Schedule",
+        description="Checks Karley's availability for a pickleball game on a given date.",
+        tags=["scheduling", "calendar"],
+        examples=["Is Karley free to play pickleball tomorrow?"],
+    )
+    agent_card = AgentCard(
+        name="Karley Agent",
+        description="An agent that manages Karley's schedule for pickleball games.",
+        url=f"http://{HOST}:{PORT}/",
+        version="1.0.0",
+        defaultInputModes=["text/plain"],
+        defaultOutputModes=["text/plain"],
+        capabilities=capabilities,
+        skills=[skill],
+    )
+
+    adk_agent = create_agent()
+    runner = Runner(
+        app_name=agent_card.name,
+        agent=adk_agent,
+        artifact_service=InMemoryArtifactService(),
+        session_service=InMemorySessionService(),
+        memory_service=InMemoryMemoryService(),
+    )
+    agent_executor = KarleyAgentExecutor(runner)
+
+    request_handler = DefaultRequestHandler(
+        agent_executor=agent_executor,
+        task_store=InMemoryTaskStore(),
+    )
+    server = A2AStarletteApplication(
+        agent_card=agent_card, http_handler=request_handler
+    )
+    return server.build()
@@ -1,23 +1,31 @@
 import asyncio
 import json
+import logging
+import os
 import uuid
-from datetime import datetime
+from collections import deque
+from datetime import date
 from typing import Any, AsyncIterable, List
 
 import httpx
-import nest_asyncio
 from a2a.client import A2ACardResolver
 from a2a.types import (
     AgentCard,
+    Message,
     MessageSendParams,
+    Part,
+    Role,
     SendMessageRequest,
     SendMessageResponse,
     SendMessageSuccessResponse,
     Task,
+    TextPart,
 )
 from dotenv import load_dotenv
 from google.adk import Agent
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
@@ -38,25 +46,62 @@ model = model()
 from .remote_agent_connection import RemoteAgentConnections
 
 load_dotenv()
-nest_asyncio.apply()
+
+logger = logging.getLogger(__name__)
+
+_UUID_BATCH_SIZE = 64
+_UUID_POOL: deque[uuid.UUID] = deque()
+# A forked child must not hand out the same IDs as its parent.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_UUID_POOL.clear)
+
+
+def _next_uuid() -> str:
+    """
+    Returns a random (version 4) UUID string from a pool that is refilled
+    with a single os.urandom() call per batch instead of one per UUID.
+    """
+    if not _UUID_POOL:
+        raw = os.urandom(16 * _UUID_BATCH_SIZE)
+        _UUID_POOL.extend(
+            uuid.UUID(bytes=raw[i : i + 16], version=4)
+            for i in range(0, len(raw), 16)
+        )
+    return str(_UUID_POOL.popleft())
 
 
 class OrchestratorAgent:
     """The Orchestrator agent coordinates tasks among a network of other agents."""
 
-    def __init__(self, tools: List[Any] = None):
+    def __init__(
+        self, tools: List[Any] = None, remote_agent_addresses: List[str] = None
+    ):
         """
         Initializes the OrchestratorAgent.
 
         Args:
             tools: A list of tool functions for the agent to use, in addition
                    to its built-in `send_message` tool.
+            remote_agent_addresses: The addresses of the remote agents to
+                   discover the first time the agent is used.
         """
+        self._remote_agent_addresses = remote_agent_addresses or []
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
         self.agents: str = ""
+        self._instruction_cache: tuple[date, str] | None = None
+        # One pooled client is shared by every remote agent connection, so
+        # keep-alive connections are reused across messages.
+        self._httpx_client = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=64),
+        )
         self._agent = self.create_agent(additional_tools=tools or [])
         self._user_id = "orchestrator_agent"
+        # Ids of sessions `stream` already knows to exist in the session service.
+        self._known_sessions: set[str] = set()
         self._runner = Runner(
             app_name=self._agent.name,
             agent=self._agent,
@@ -69,27 +114,46 @@ class OrchestratorAgent:
         """
         Asynchronously discovers and establishes connections with remote agents.
         """
-        async with httpx.AsyncClient(timeout=30) as client:
-            for address in remote_agent_addresses:
+        # Discovery uses its own short-lived client, so no keep-alive
+        # connection from this event loop is left in the shared pool for
+        # send_message to reuse from another loop.
+        async with httpx.AsyncClient(
+            timeout=30, limits=httpx.Limits(max_connections=64)
+        ) as client:
+
+            async def _fetch(address: str):
                 card_resolver = A2ACardResolver(client, address)
                 try:
-                    card = await card_resolver.get_agent_card()
-                    remote_connection = RemoteAgentConnections(
-                        agent_card=card, agent_url=address
-                    )
-                    self.remote_agent_connections[card.name] = remote_connection
-                    self.cards[card.name] = card
-                except httpx.ConnectError as e:
-                    print(f"ERROR: Failed to get agent card from {address}: {e}")
+                    return address, await card_resolver.get_agent_card()
                 except Exception as e:
-                    print(f"ERROR: Failed to initialize connection for {address}: {e}")
+                    logger.error("Failed to get agent card from %s: %s", address, e)
+                return address, None
+
+            # Resolve every card concurrently so startup waits on the slowest
+            # remote agent rather than the sum of all of them.
+            results = await asyncio.gather(
+                *(_fetch(address) for address in remote_agent_addresses)
+            )
+
+        for address, card in results:
+            if card is None:
+                continue
+            try:
+                remote_connection = RemoteAgentConnections(
+                    agent_card=card, agent_url=address, client=self._httpx_client
+                )
+                self.remote_agent_connections[card.name] = remote_connection
+                self.cards[card.name] = card
+            except Exception as e:
+                logger.error("Failed to initialize connection for %s: %s", address, e)
 
         agent_info = [
             json.dumps({"name": card.name, "description": card.description})
             for card in self.cards.values()
         ]
-        print("agent_info:", agent_info)
+        logger.info("agent_info: %s", agent_info)
         self.agents = "\n".join(agent_info) if agent_info else "No connected agents found."
+        self._instruction_cache = None
 
     @classmethod
     async def create(
@@ -98,21 +162,51 @@ class OrchestratorAgent:
         """
         Factory method to create and asynchronously initialize an OrchestratorAgent instance.
         """
-        instance = cls(tools=tools)
-        await instance._async_init_components(remote_agent_addresses)
+        instance = cls(tools=tools, remote_agent_addresses=remote_agent_addresses)
+        await instance.ensure_initialized()
         return instance
 
+    async def ensure_initialized(self):
+        """
+        Discovers the remote agents on first call; later calls return at once.
+        """
+        if self._initialized:
+            return
+        async with self._init_lock:
+            if not self._initialized:
+                logger.info("Initializing Orchestrator Agent...")
+                await self._async_init_components(self._remote_agent_addresses)
+                self._initialized = True
+                logger.info("Orchestrator Agent initialized.")
+
+    async def _before_agent(self, callback_context: CallbackContext):
+        """
+        Runs remote agent discovery before the agent's first turn.
+        """
+        await self.ensure_initialized()
+        return None
+
+    async def aclose(self):
+        """
+        Closes the HTTP client shared with the remote agent connections.
+
+        The module-level orchestrator below never calls this: its client stays
+        open for the lifetime of the process.
+        """
+        await self._httpx_client.aclose()
+
     def create_agent(self, additional_tools: List[Any]) -> Agent:
         """
         Creates the underlying ADK Agent object.
         """
-        base_tools = [self.send_message]
+        base_tools = [self.send_message, self.send_messages_batch]
         all_tools = base_tools + additional_tools
 
         return Agent(
             model=model,
             name="Orchestrator_Agent",
             instruction=self.root_instruction,
+            before_agent_callback=self._before_agent,
             description="This agent orchestrates tasks by delegating to a network of other specialized agents.",
             tools=all_tools,
         )
@@ -120,28 +214,39 @@ class OrchestratorAgent:
     def root_instruction(self, context: ReadonlyContext) -> str:
         """
         Provides the root instruction prompt for the orchestrator model.
+
+        The prompt only changes when the date rolls over or the set of
+        connected agents is refreshed, so it is built once and reused on
+        every other model call.
         """
-        return f"""
+        today = date.today()
+        if self._instruction_cache and self._instruction_cache[0] == today:
+            return self._instruction_cache[1]
+
+        instruction = f"""
         **Role:** You are an Orchestrator Agent, an expert in coordinating tasks among a group of specialized agents. Your primary function is to understand user requests, delegate sub-tasks to the appropriate agent, synthesize the results, and provide a final answer.
 
         **Core Directives:**
 
         * **Analyze the Request:** Break down the user's request into smaller, manageable sub-tasks.
         * **Task Delegation:** Identify the best agent for each sub-task based on their description. Use the `send_message` tool to delegate.
+            * When several sub-tasks are independent of each other, delegate them together with the `send_messages_batch` tool so the agents work in parallel.
             * Frame your request clearly and provide all necessary context.
             * You must pass the official name of the agent to the `agent_name` parameter.
         * **Synthesize Results:** Once you receive responses from the agents, combine and analyze the information to formulate a comprehensive answer.
-        * **Manage Tools:** If the request requires a capability you possess (i.e., a tool other than `send_message`), use that tool directly.
+        * **Manage Tools:** If the request requires a capability you possess (i.e., a tool other than `send_message` or `send_messages_batch`), use that tool directly.
         * **Transparent Communication:** Keep the user informed of your progress. Relay final answers in a clear and easy-to-read format (e.g., using bullet points).
         * **Tool Reliance:** Strictly rely on the available tools to address user requests. Do not generate responses based on assumptions.
         * **Agent Awareness:** The agents listed below are the only ones available to you for delegation.
 
-        **Today's Date (YYYY-MM-DD):** {datetime.now().strftime("%Y-%m-%d")}
+        **Today's Date (YYYY-MM-DD):** {today.strftime("%Y-%m-%d")}
 
         <Available Agents>
         {self.agents}
         </Available Agents>
         """
+        self._instruction_cache = (today, instruction)
+        return instruction
 
     async def stream(
         self, query: str, session_id: str
@@ -149,41 +254,72 @@ class OrchestratorAgent:
         """
         Streams the agent's response to a given query for a specific session.
         """
-        session = await self._runner.session_service.get_session(
-            app_name=self._agent.name,
-            user_id=self._user_id,
-            session_id=session_id,
-        )
         content = types.Content(role="user", parts=[types.Part.from_text(text=query)])
-        if session is None:
-            session = await self._runner.session_service.create_session(
+        # The runner loads the session itself, so only its existence needs
+        # checking, and only the first time a session id is seen.
+        if session_id not in self._known_sessions:
+            session = await self._runner.session_service.get_session(
                 app_name=self._agent.name,
                 user_id=self._user_id,
-                state={},
                 session_id=session_id,
             )
-        async for event in self._runner.run_async(
-            user_id=self._user_id, session_id=session.id, new_message=content
-        ):
-            if event.is_final_response():
-                response = ""
-                if (
-                    event.content
+            if session is None:
+                await self._runner.session_service.create_session(
+                    app_name=self._agent.name,
+                    user_id=self._user_id,
+                    state={},
+                    session_id=session_id,
+                )
+            self._known_sessions.add(session_id)
+        # SSE streaming surfaces model text as partial events while it is being
+        # generated instead of only once the whole completion has arrived.
+        try:
+            async for event in self._runner.run_async(
+                user_id=self._user_id,
+                session_id=session_id,
+                new_message=content,
+                run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+            ):
+                if event.is_final_response():
+                    response = ""
+                    if (
+                        event.content
+                        and event.content.parts
+                        and event.content.parts[0].text
+                    ):
+                        response = "\n".join(
+                            [p.text for p in event.content.parts if p.text]
+                        )
+                    yield {
+                        "is_task_complete": True,
+                        "content": response,
+                    }
+                elif (
+                    event.partial
+                    and event.content
                     and event.content.parts
-                    and event.content.parts[0].text
+                    and (text := "".join(p.text for p in event.content.parts if p.text))
                 ):
-                    response = "\n".join(
-                        [p.text for p in event.content.parts if p.text]
-                    )
-                yield {
-                    "is_task_complete": True,
-                    "content": response,
-                }
-            else:
-                yield {
-                    "is_task_complete": False,
-                    "updates": "The orchestrator agent is thinking...",
-                }
+                    yield {
+                        "is_task_complete": False,
+                        "updates": text,
+                    }
+                else:
+                    yield {
+                        "is_task_complete": False,
+                        "updates": "The orchestrator agent is thinking...",
+                    }
+        except ValueError:
+            # The runner raises ValueError for a missing session, but tools can
+            # raise it too, so only forget the id if the session is really gone.
+            session = await self._runner.session_service.get_session(
+                app_name=self._agent.name,
+                user_id=self._user_id,
+                session_id=session_id,
+            )
+            if session is None:
+                self._known_sessions.discard(session_id)
+            raise
 
     async def send_message(self, agent_name: str, task: str, tool_context: ToolContext):
         """
@@ -194,6 +330,69 @@ class OrchestratorAgent:
             task: The specific task or question to send to the agent.
             tool_context: The context provided by the ADK tool-calling framework.
         """
+        return await self._send_one(agent_name, task, tool_context)
+
+    async def send_messages_batch(
+        self, agent_names: list[str], tasks: list[str], tool_context: ToolContext
+    ):
+        """
+        Sends several independent tasks to connected remote agents at the same
+        time and returns every response.
+
+        Args:
+            agent_names: The official names of the target agents, one per task.
+            tasks: The tasks or questions to send; `tasks[i]` is sent to
+                   `agent_names[i]`.
+            tool_context: The context provided by the ADK tool-calling framework.
+
+        Returns:
+            A list with one `{"agent_name": ..., "response": ...}` entry per
+            task, in the same order as `tasks`.
+        """
+        if (
+            not isinstance(agent_names, list)
+            or not isinstance(tasks, list)
+            or len(agent_names) != len(tasks)
+        ):
+            return "Error: `agent_names` and `tasks` must be lists of the same length."
+
+        # Every sub-task in the batch belongs to the same parent conversation.
+        context_id = tool_context.state.get("context_id") or _next_uuid()
+
+        async def _send_target(agent_name: str, task: str):
+            if not isinstance(agent_name, str) or not isinstance(task, str):
+                raise ValueError("Each agent name and task must be a string.")
+            return await self._send_one(
+                agent_name, task, tool_context, context_id=context_id
+            )
+
+        results = await asyncio.gather(
+            *(
+                _send_target(agent_name, task)
+                for agent_name, task in zip(agent_names, tasks)
+            ),
+            return_exceptions=True,
+        )
+        return [
+            {
+                "agent_name": agent_name,
+                "response": f"Error: {result}"
+                if isinstance(result, BaseException)
+                else result,
+            }
+            for agent_name, result in zip(agent_names, results)
+        ]
+
+    async def _send_one(
+        self,
+        agent_name: str,
+        task: str,
+        tool_context: ToolContext,
+        context_id: str | None = None,
+    ):
+        """
+        Sends a single task to a remote agent and extracts its artifact parts.
+        """
         if agent_name not in self.remote_agent_connections:
             raise ValueError(f"Agent '{agent_name}' not found. Available agents: {list(self.remote_agent_connections.keys())}")
         
@@ -203,87 +402,65 @@ class OrchestratorAgent:
             raise ValueError(f"Client connection not available for {agent_name}")
 
         state = tool_context.state
-        task_id = state.get("task_id", str(uuid.uuid4()))
-        context_id = state.get("context_id", str(uuid.uuid4()))
-        message_id = str(uuid.uuid4())
-
-        payload = {
-            "message": {
-                "role": "user",
-                "parts": [{"type": "text", "text": task}],
-                "messageId": message_id,
-                "taskId": task_id,
-                "contextId": context_id,
-            },
-        }
-
+        task_id = state.get("task_id") or _next_uuid()
+        context_id = context_id or state.get("context_id") or _next_uuid()
+        message_id = _next_uuid()
+
+        message = Message(
+            role=Role.user,
+            parts=[Part(root=TextPart(text=task))],
+            messageId=message_id,
+            taskId=task_id,
+            contextId=context_id,
+        )
         message_request = SendMessageRequest(
-            id=message_id, params=MessageSendParams.model_validate(payload)
+            id=message_id, params=MessageSendParams(message=message)
         )
         send_response: SendMessageResponse = await client.send_message(message_request)
-        print("send_response", send_response)
+        logger.debug("send_response %s", send_response)
 
         if not isinstance(
             send_response.root, SendMessageSuccessResponse
         ) or not isinstance(send_response.root.result, Task):
-            print("Received a non-success or non-task response. Cannot proceed.")
+            logger.warning("Received a non-success or non-task response. Cannot proceed.")
             return "Error: Failed to get a valid response from the agent."
 
-        response_content = send_response.root.model_dump_json(exclude_none=True)
-        json_content = json.loads(response_content)
-
+        result: Task = send_response.root.result
         resp = []
-        if json_content.get("result", {}).get("artifacts"):
-            for artifact in json_content["result"]["artifacts"]:
-                if artifact.get("parts"):
-                    resp.extend(artifact["parts"])
+        for artifact in result.artifacts or []:
+            resp.extend(
+                part.model_dump(mode="json", exclude_none=True)
+                for part in artifact.parts or []
+            )
         return resp
 
 
-def _get_initialized_orchestrator_agent_sync():
-    """
-    Synchronously creates and initializes the OrchestratorAgent.
-    This is a helper function for environments where top-level await is not available.
-    """
-
-    async def _async_main():
-        # --- CONFIGURATION ---
-        # List the network addresses for all agents the orchestrator should connect to.
-        remote_agent_urls = [
-            "http://localhost:10002",  # Example: Weather_Agent
-            "http://localhost:10003",  # Example: Calendar_Agent
-            "http://localhost:10004",  # Example: Database_Agent
-        ]
-        
-        # List any additional tools the orchestrator itself should have.
-        # For example, a tool to perform a web search.
-        # from .custom_tools import web_search_tool
-        # orchestrator_tools = [web_search_tool]
-        orchestrator_tools = []
-
-
-        print("Initializing Orchestrator Agent...")
-        orchestrator_instance = await OrchestratorAgent.create(
-            remote_agent_addresses=remote_agent_urls,
-            tools=orchestrator_tools
-        )
-        print("Orchestrator Agent initialized.")
-        return orchestrator_instance.create_agent(additional_tools=orchestrator_tools)
-
-    try:
-        # Attempt to run the async main function
-        return asyncio.run(_async_main())
-    except RuntimeError as e:
-        if "cannot be called from a running event loop" in str(e):
-            print(
-                f"Warning: Could not initialize OrchestratorAgent with asyncio.run(): {e}. "
-                "This can happen if an event loop is already running (e.g., in Jupyter). "
-                "Consider initializing the agent within an async function in your application."
-            )
-        else:
-            raise
+# --- CONFIGURATION ---
+# List the network addresses for all agents the orchestrator should connect to.
+REMOTE_AGENT_URLS = [
+    "http://localhost:10002",  # Example: Weather_Agent
+    "http://localhost:10003",  # Example: Calendar_Agent
+    "http://localhost:10004",  # Example: Database_Agent
+]
+
+# List any additional tools the orchestrator itself should have.
+# For example, a tool to perform a web search.
+# from .custom_tools import web_search_tool
+# ORCHESTRATOR_TOOLS = [web_search_tool]
+ORCHESTRATOR_TOOLS = []
+
+# Building the agent does no network I/O: remote agents are discovered on
+# first use, inside the event loop that serves the agent. The orchestrator's
+# shared HTTP client is left open for the lifetime of the process.
+_orchestrator = OrchestratorAgent(
+    tools=ORCHESTRATOR_TOOLS, remote_agent_addresses=REMOTE_AGENT_URLS
+)
+root_agent = _orchestrator.create_agent(additional_tools=ORCHESTRATOR_TOOLS)
 
 
-# This call creates the agent instance when the module is loaded.
-# It can be modified to be instantiated on demand.
-root_agent = _get_initialized_orchestrator_agent_sync()
\ No newline at end of file
+async def get_root_agent() -> Agent:
+    """
+    Returns the root agent once its remote agents have been discovered.
+    """
+    await _orchestrator.ensure_initialized()
+    return root_agent
@@ -1,3 +1,4 @@
+import logging
 from typing import Callable
 
 import httpx
@@ -14,6 +15,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 
@@ -21,10 +24,15 @@ TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 class RemoteAgentConnections:
     """A class to hold the connections to the remote agents."""
 
-    def __init__(self, agent_card: AgentCard, agent_url: str):
-        print(f"agent_card: {agent_card}")
-        print(f"agent_url: {agent_url}")
-        self._httpx_client = httpx.AsyncClient(timeout=30)
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        agent_url: str,
+        client: httpx.AsyncClient | None = None,
+    ):
+        logger.debug("agent_card: %s", agent_card)
+        logger.debug("agent_url: %s", agent_url)
+        self._httpx_client = client or httpx.AsyncClient(timeout=30)
         self.agent_client = A2AClient(self._httpx_client, agent_card, url=agent_url)
         self.card = agent_card
         self.conversation_name = None